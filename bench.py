@@ -0,0 +1,325 @@
+"""HTTP benchmark for every /api route.
+
+Drives each route registered under /api in app.py, either in-process through
+the Flask test client or against a running server over HTTP, and reports
+p50/p95/p99 latency, throughput, SQL queries per request (from the
+X-Query-Count header) and status codes as JSON. Bookings go to far-future
+slots after the latest one in the database, so repeated runs against the
+same data take the same code paths (with --http, DATABASE_URL must name the
+server's database too):
+
+    DATABASE_URL=sqlite:///bench.db python datagen.py --scale small
+    DATABASE_URL=sqlite:///bench.db python bench.py --out before.json
+    python bench.py --http http://127.0.0.1:5000 --concurrency 16 --out after.json
+    python bench.py --compare before.json after.json
+
+Routes without an entry in SCENARIOS are reported as "unbenchmarked" so new
+endpoints do not silently drop out of the suite. --compare flags a route
+whose status mix changed, since its timings then measure another path.
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+
+class TestClient:
+    def __init__(self, client):
+        self.client = client
+
+    def request(self, method, path, body=None, headers=None):
+        resp = self.client.open(path, method=method, json=body, headers=headers or {})
+        return resp.status_code, resp.headers, resp.get_data()
+
+
+class HttpClient:
+    def __init__(self, base):
+        self.base = base.rstrip("/")
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+
+    def request(self, method, path, body=None, headers=None):
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(self.base + path, data=data, method=method, headers=dict(headers or {}))
+        if data is not None:
+            req.add_header("Content-Type", "application/json")
+        try:
+            with self.opener.open(req) as resp:
+                return resp.status, resp.headers, resp.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers, e.read()
+
+
+class Context:
+    """Per-client state scenarios draw ids and unique slots from."""
+
+    _slot_seq = 0
+    _slot_lock = threading.Lock()
+    slot_base = datetime(2090, 1, 1)  # benchmark() moves it past earlier runs' bookings
+
+    def __init__(self, client, seed, doctors, email, password, admin_token=None):
+        self.client = client
+        self.admin = {"X-Admin-Token": admin_token or ""}
+        self.rng = random.Random(seed)
+        self.doctors = doctors
+        self.email = email
+        self.password = password
+        self.login()
+
+    def login(self):
+        status, _, _ = self.client.request("POST", "/api/login", {"email": self.email, "password": self.password})
+        if status != 200:
+            sys.exit(f"login as {self.email} failed ({status}); generate data with datagen.py first")
+
+    def doctor(self):
+        return self.rng.choice(self.doctors)
+
+    def free_slot(self):
+        # far-future slots nobody else books, unique across all threads and runs:
+        # the shared sequence numbers them 16 to a day from slot_base
+        with Context._slot_lock:
+            Context._slot_seq += 1
+            seq = Context._slot_seq
+        day, slot = divmod(seq, 16)
+        return (Context.slot_base + timedelta(days=day, minutes=30 * slot)).isoformat()
+
+    def json(self, method, path, body=None):
+        status, _, data = self.client.request(method, path, body)
+        return json.loads(data) if status < 400 else {}
+
+    def book(self):
+        return self.json("POST", "/api/appointments", {"doctor_id": self.doctor(), "start_datetime": self.free_slot()})
+
+    def own_appointment(self):
+        return self.book().get("id", 0)
+
+
+def analytics_window(days=30):
+    today = datetime.now().date()
+    return f"from={today - timedelta(days=days)}&to={today + timedelta(days=days)}"
+
+
+# (method, rule) -> fn(ctx) returning (path, body[, headers]); untimed setup happens inside fn
+SCENARIOS = {
+    ("POST", "/api/login"): lambda c: ("/api/login", {"email": c.email, "password": c.password}),
+    ("POST", "/api/signup"): lambda c: ("/api/signup", {
+        "name": "Bench User", "email": f"bench-{time.time_ns()}-{c.rng.random()}@example.com", "password": "password"}),
+    ("POST", "/api/logout"): lambda c: ("/api/logout", None),
+    ("GET", "/api/me"): lambda c: ("/api/me", None),
+    ("PUT", "/api/me"): lambda c: ("/api/me", {"contact": f"+91-{c.rng.randrange(10**9):09d}"}),
+    ("GET", "/api/bootstrap"): lambda c: ("/api/bootstrap", None),
+    ("GET", "/api/doctors"): lambda c: ("/api/doctors", None),
+    ("GET", "/api/doctors/search"): lambda c: (
+        "/api/doctors/search?q=" + c.rng.choice(["car", "skin", "care", "dr", "heart"]) + "&limit=20", None),
+    ("GET", "/api/doctors/<int:doctor_id>"): lambda c: (f"/api/doctors/{c.doctor()}", None),
+    ("GET", "/api/doctors/<int:doctor_id>/availability"): lambda c: (f"/api/doctors/{c.doctor()}/availability", None),
+    ("GET", "/api/appointments"): lambda c: ("/api/appointments?mine=1&limit=50", None),
+    ("POST", "/api/appointments"): lambda c: ("/api/appointments", {"doctor_id": c.doctor(), "start_datetime": c.free_slot()}),
+    ("POST", "/api/appointments/batch"): lambda c: ("/api/appointments/batch", [
+        {"doctor_id": c.doctor(), "start_datetime": c.free_slot()} for _ in range(10)]),
+    ("GET", "/api/appointments/<int:appt_id>"): lambda c: (f"/api/appointments/{c.rng.randint(1, 1000)}", None),
+    ("DELETE", "/api/appointments/<int:appt_id>"): lambda c: (f"/api/appointments/{c.own_appointment()}", None),
+    ("GET", "/api/favorites"): lambda c: ("/api/favorites", None),
+    ("POST", "/api/favorites"): lambda c: ("/api/favorites", {"doctor_id": c.doctor()}),
+    ("DELETE", "/api/favorites/<int:doctor_id>"): lambda c: (f"/api/favorites/{c.doctor()}", None),
+    ("GET", "/api/bills"): lambda c: ("/api/bills", None),
+    ("POST", "/api/bills/<int:bill_id>/pay"): lambda c: (f"/api/bills/{c.book().get('bill_id', 0)}/pay", None),
+    ("GET", "/api/admin/balances"): lambda c: ("/api/admin/balances?limit=100", None, c.admin),
+    ("GET", "/api/admin/analytics/doctors/<int:doctor_id>"): lambda c: (
+        f"/api/admin/analytics/doctors/{c.doctor()}?{analytics_window()}", None, c.admin),
+    ("GET", "/api/admin/analytics/departments"): lambda c: (f"/api/admin/analytics/departments?{analytics_window()}", None, c.admin),
+}
+# statuses a scenario legitimately produces besides 200; anything else counts as an error
+EXPECTED_STATUSES = {}
+# routes that end the session; the context logs back in afterwards
+RELOGIN = {("POST", "/api/logout")}
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def api_routes(app):
+    routes = set()
+    for rule in app.url_map.iter_rules():
+        if rule.rule.startswith("/api/"):
+            for method in rule.methods - {"HEAD", "OPTIONS"}:
+                routes.add((method, rule.rule))
+    return sorted(routes, key=lambda r: (r[1], r[0]))
+
+
+def run_route(contexts, key, requests, warmup):
+    method, _ = key
+    scenario = SCENARIOS[key]
+    expected = EXPECTED_STATUSES.get(key, {200})
+    samples, queries, statuses = [], [], Counter()
+    lock = threading.Lock()
+
+    def worker(ctx, n, record):
+        for _ in range(n):
+            path, body, *extra = scenario(ctx)
+            t0 = time.perf_counter()
+            status, headers, _ = ctx.client.request(method, path, body, *extra)
+            elapsed = time.perf_counter() - t0
+            if key in RELOGIN:
+                ctx.login()
+            if not record:
+                continue
+            with lock:
+                samples.append(elapsed)
+                if headers.get("X-Query-Count") is not None:
+                    queries.append(int(headers["X-Query-Count"]))
+                statuses[status] += 1
+
+    per_worker = [requests // len(contexts) + (i < requests % len(contexts)) for i in range(len(contexts))]
+    with ThreadPoolExecutor(max_workers=len(contexts)) as pool:
+        list(pool.map(lambda ctx: worker(ctx, warmup, False), contexts))
+        started = time.perf_counter()
+        list(pool.map(lambda args: worker(args[0], args[1], True), zip(contexts, per_worker)))
+        wall = time.perf_counter() - started
+
+    samples.sort()
+    ms = lambda v: round(v * 1000, 3) if v is not None else None
+    return {
+        "requests": len(samples),
+        "errors": sum(n for code, n in statuses.items() if code not in expected),
+        "statuses": dict((str(code), n) for code, n in sorted(statuses.items())),
+        "p50_ms": ms(percentile(samples, 50)),
+        "p95_ms": ms(percentile(samples, 95)),
+        "p99_ms": ms(percentile(samples, 99)),
+        "mean_ms": ms(sum(samples) / len(samples)) if samples else None,
+        "throughput_rps": round(len(samples) / wall, 1) if wall > 0 else None,
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark(args):
+    from app import create_app, db, Appointment
+    from sqlalchemy import func
+    app = create_app()
+    with app.app_context():
+        latest = db.session.query(func.max(Appointment.start_datetime)).scalar()
+    if latest is not None and latest >= Context.slot_base:
+        Context.slot_base = datetime.combine(latest.date() + timedelta(days=1), datetime.min.time())
+
+    if args.http:
+        make_client = lambda: HttpClient(args.http)
+    else:
+        make_client = lambda: TestClient(app.test_client())
+
+    probe = make_client()
+    status, _, data = probe.request("GET", "/api/doctors")
+    if status != 200 or not json.loads(data):
+        sys.exit("no doctors found; generate data with datagen.py first")
+    doctors = [d["id"] for d in json.loads(data)]
+    contexts = [Context(make_client(), args.seed + i, doctors, args.email, args.password, args.admin_token)
+                for i in range(args.concurrency)]
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "mode": "http" if args.http else "test_client",
+            "target": args.http or app.config["SQLALCHEMY_DATABASE_URI"].split("@")[-1],
+            "concurrency": args.concurrency,
+            "requests_per_route": args.requests,
+            "python": platform.python_version(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "slot_base": Context.slot_base.isoformat(),
+        },
+        "routes": {},
+        "unbenchmarked": [],
+    }
+    for key in api_routes(app):
+        if args.only and not any(s in key[1] for s in args.only):
+            continue
+        if key not in SCENARIOS:
+            report["unbenchmarked"].append(" ".join(key))
+            continue
+        result = run_route(contexts, key, args.requests, args.warmup)
+        report["routes"][" ".join(key)] = result
+        print(f"{' '.join(key):<55} p50 {result['p50_ms']:>8} ms  p95 {result['p95_ms']:>8} ms  "
+              f"{result['throughput_rps']:>8} rps  q/req {result['queries_per_request']}", file=sys.stderr)
+    for key in report["unbenchmarked"]:
+        print(f"unbenchmarked: {key}", file=sys.stderr)
+    return report
+
+
+def status_mix(result):
+    # share of each status code, rounded so run-to-run noise does not count as a change
+    total = sum(result.get("statuses", {}).values()) or 1
+    return dict((code, round(n / total, 1)) for code, n in result.get("statuses", {}).items())
+
+
+def compare(old_path, new_path, threshold):
+    with open(old_path) as f:
+        old = json.load(f)["routes"]
+    with open(new_path) as f:
+        new = json.load(f)["routes"]
+    regressions = 0
+    for route in sorted(set(old) | set(new)):
+        a, b = old.get(route), new.get(route)
+        if not a or not b:
+            print(f"{route:<55} {'only in ' + (old_path if a else new_path)}")
+            continue
+        change = (b["p95_ms"] - a["p95_ms"]) / a["p95_ms"] if a["p95_ms"] else 0.0
+        flag = "REGRESSION" if change > threshold else ""
+        # a route answering differently (409s, 404s) takes another code path: its timings say nothing
+        if status_mix(a) != status_mix(b) or b["errors"]:
+            flag = f"STATUS {status_mix(a)} -> {status_mix(b)}"
+        regressions += bool(flag)
+        print(f"{route:<55} p95 {a['p95_ms']:>8} -> {b['p95_ms']:>8} ms ({change:+.0%})  "
+              f"q/req {a['queries_per_request']} -> {b['queries_per_request']}  {flag}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--http", help="base URL of a running server (default: in-process test client)")
+    parser.add_argument("--requests", type=int, default=200, help="timed requests per route")
+    parser.add_argument("--warmup", type=int, default=10, help="untimed requests per route and client")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--email", default="patient1@example.com")
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--admin-token", default=os.environ.get("ADMIN_TOKEN"), help="for /api/admin/* routes")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--only", nargs="*", help="only routes containing one of these substrings")
+    parser.add_argument("--out", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="diff two reports; exit 1 on p95 regressions or status changes")
+    parser.add_argument("--threshold", type=float, default=0.2, help="p95 slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(compare(*args.compare, args.threshold))
+    report = benchmark(args)
+    out = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Deterministic synthetic data for load testing.
+
+Writes doctors, patients, appointments, bills and favorites straight through
+SQLAlchemy Core in bounded chunks, so it works against the MySQL schema as
+well as a local SQLite file:
+
+    DATABASE_URL=sqlite:///bench.db python datagen.py --scale small
+    python datagen.py --doctors 10000 --patients 1000000 --appointments 10000000
+
+The same seed and sizes always produce the same rows. Every generated patient
+can log in as patient<id>@example.com / password.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import func, insert
+
+from app import create_app, db, Doctor, Patient, Appointment, Bill, Favorite, CLINIC_SLOTS, CONSULTATION_FEE, SLOT_MINUTES, claim_reservations, rebuild_ledger, rebuild_rollups
+
+SCALES = {
+    "tiny": (20, 200, 2_000),
+    "small": (100, 10_000, 100_000),
+    "medium": (1_000, 100_000, 1_000_000),
+    "large": (10_000, 1_000_000, 10_000_000),
+}
+DEPARTMENTS = [
+    "Cardiology", "Dermatology", "General Medicine", "Neurology", "Orthopedics",
+    "Pediatrics", "Psychiatry", "Oncology", "Gastroenterology", "Ophthalmology",
+    "ENT", "Nephrology", "Pulmonology", "Endocrinology", "Physiotherapy",
+]
+FIRST = ["Asha", "Rahul", "Olivia", "Arjun", "Tiya", "Ankit", "Simran", "Nia", "Vikram", "Meera",
+         "Kabir", "Zara", "Rohan", "Isha", "Dev", "Anya", "Karan", "Leela", "Sameer", "Priya"]
+LAST = ["Rao", "Mehra", "Turner", "Kapoor", "Singh", "Verma", "Kaur", "Allina", "Shah", "Iyer",
+        "Gupta", "Das", "Nair", "Bose", "Khan", "Patel", "Reddy", "Joshi", "Menon", "Sethi"]
+BIO_WORDS = ["care", "diagnosis", "chronic", "pain", "surgery", "therapy", "allergy", "skin",
+             "heart", "brain", "child", "sleep", "diet", "sports", "injury", "screening",
+             "diabetes", "thyroid", "asthma", "kidney", "eye", "hearing", "cancer", "rehab"]
+REASONS = ["Checkup", "Follow-up", "Fever", "Consultation", "Review reports", "Pain", "Vaccination", ""]
+
+
+def chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def doctor_rows(rng, first_id, n):
+    for i in range(first_id, first_id + n):
+        yield {
+            "id": i,
+            "name": f"Dr. {rng.choice(FIRST)} {rng.choice(LAST)}",
+            "department": rng.choice(DEPARTMENTS),
+            "experience": rng.randint(0, 40),
+            "contact": f"+91-7{i:09d}",
+            "email": f"doctor{i}@example.com",
+            "bio": " ".join(rng.choice(BIO_WORDS) for _ in range(rng.randint(6, 20))),
+            "photo_url": f"https://randomuser.me/api/portraits/{rng.choice(['men', 'women'])}/{i % 100}.jpg",
+            "created_at": datetime(2024, 1, 1),
+        }
+
+
+def patient_rows(rng, first_id, n):
+    for i in range(first_id, first_id + n):
+        yield {
+            "id": i,
+            "name": f"{rng.choice(FIRST)} {rng.choice(LAST)}",
+            "dob": datetime(1940, 1, 1).date() + timedelta(days=rng.randint(0, 30000)),
+            "gender": rng.choice(["Male", "Female", "Other"]),
+            "contact": f"+91-8{i:09d}",
+            "email": f"patient{i}@example.com",
+            "address": rng.choice(["Delhi", "Noida", "Gurgaon", "Mumbai", "Pune", "Bengaluru"]),
+            "password": "password",
+            "created_at": datetime(2024, 1, 1),
+        }
+
+
+def appointment_rows(rng, first_id, n, doctors, patients, start_day):
+    # appointment k goes to doctor k % D in that doctor's (k // D)-th clinic slot,
+    # so no two appointments of a doctor ever overlap
+    slot_times = [tuple(map(int, t.split(":"))) for t in CLINIC_SLOTS]
+    d_first, d_count = doctors
+    p_first, p_count = patients
+    for k in range(n):
+        seq = k // d_count
+        day = start_day + timedelta(days=seq // len(slot_times))
+        hh, mm = slot_times[seq % len(slot_times)]
+        start = datetime(day.year, day.month, day.day, hh, mm)
+        r = rng.random()
+        yield {
+            "id": first_id + k,
+            "patient_id": p_first + rng.randrange(p_count),
+            "doctor_id": d_first + k % d_count,
+            "start_datetime": start,
+            "end_datetime": start + timedelta(minutes=SLOT_MINUTES),
+            "status": "scheduled" if r < 0.7 else "completed" if r < 0.9 else "canceled",
+            "reason": rng.choice(REASONS),
+            "created_at": start - timedelta(days=rng.randint(1, 30)),
+        }
+
+
+def bill_rows(rng, first_id, appointments):
+    for i, a in enumerate(appointments):
+        paid = a["status"] == "completed" or rng.random() < 0.3
+        yield {
+            "id": first_id + i,
+            "patient_id": a["patient_id"],
+            "appointment_id": a["id"],
+            "amount": CONSULTATION_FEE,
+            "status": "paid" if paid else "unpaid",
+            "paid_at": a["start_datetime"] if paid else None,
+            "created_at": a["created_at"],
+        }
+
+
+def load(table, rows, chunk_size, label):
+    started = time.perf_counter()
+    total = 0
+    for chunk in chunks(rows, chunk_size):
+        with db.engine.begin() as conn:
+            conn.execute(insert(table), chunk)
+        total += len(chunk)
+    elapsed = time.perf_counter() - started
+    print(f"{label:>13}: {total:>10} rows in {elapsed:7.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+    return total
+
+
+def next_id(model):
+    return (db.session.query(func.max(model.id)).scalar() or 0) + 1
+
+
+def generate(doctors, patients, appointments, favorites_per_patient=0.5, seed=42,
+             start="2026-01-01", chunk_size=5000):
+    rng = random.Random(seed)
+    start_day = datetime.fromisoformat(start).date()
+    db.create_all()
+    d_first, p_first, a_first, b_first = next_id(Doctor), next_id(Patient), next_id(Appointment), next_id(Bill)
+    db.session.close()
+
+    load(Doctor.__table__, doctor_rows(rng, d_first, doctors), chunk_size, "doctors")
+    load(Patient.__table__, patient_rows(rng, p_first, patients), chunk_size, "patients")
+
+    # appointments and their bills share one pass so bills need no read-back
+    appt_rng, bill_rng = random.Random(seed + 1), random.Random(seed + 2)
+    started = time.perf_counter()
+    written = 0
+    for chunk in chunks(appointment_rows(appt_rng, a_first, appointments, (d_first, doctors), (p_first, patients), start_day), chunk_size):
+        with db.engine.begin() as conn:
+            conn.execute(insert(Appointment.__table__), chunk)
+            conn.execute(insert(Bill.__table__), list(bill_rows(bill_rng, b_first + written, chunk)))
+        written += len(chunk)
+    elapsed = time.perf_counter() - started
+    print(f"{'appointments':>13}: {written:>10} rows in {elapsed:7.1f}s ({written / max(elapsed, 1e-9):,.0f} rows/s, plus bills)")
+
+    fav_rng = random.Random(seed + 3)
+    def favorite_rows():
+        for pid in range(p_first, p_first + patients):
+            if fav_rng.random() < favorites_per_patient:
+                for did in set(fav_rng.randrange(doctors) for _ in range(fav_rng.randint(1, 3))):
+                    yield {"user_id": pid, "doctor_id": d_first + did}
+    load(Favorite.__table__, favorite_rows(), chunk_size, "favorites")
+
+    # derived tables are rebuilt from the rows above in one set-based pass each
+    started = time.perf_counter()
+    rebuild_ledger()
+    print(f"{'ledger':>13}: rebuilt in {time.perf_counter() - started:7.1f}s")
+    started = time.perf_counter()
+    rebuild_rollups()
+    print(f"{'rollups':>13}: rebuilt in {time.perf_counter() - started:7.1f}s")
+    if current_app.config["SLOT_RESERVATIONS"]:
+        started = time.perf_counter()
+        slots, _ = claim_reservations()
+        print(f"{'reservations':>13}: {slots:>10} rows in {time.perf_counter() - started:7.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=SCALES, default="tiny", help="preset sizes (doctors, patients, appointments)")
+    parser.add_argument("--doctors", type=int)
+    parser.add_argument("--patients", type=int)
+    parser.add_argument("--appointments", type=int)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--start", default="2026-01-01", help="first appointment day (YYYY-MM-DD)")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    doctors, patients, appointments = SCALES[args.scale]
+    app = create_app()
+    with app.app_context():
+        generate(
+            args.doctors or doctors,
+            args.patients or patients,
+            args.appointments or appointments,
+            seed=args.seed,
+            start=args.start,
+            chunk_size=args.chunk_size,
+        )
+
+
+if __name__ == "__main__":
+    main()
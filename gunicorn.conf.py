@@ -0,0 +1,35 @@
+"""gunicorn settings for wsgi:app; each can be overridden from the environment."""
+import multiprocessing
+import os
+
+bind = os.environ.get("WEB_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+# gevent serves each request, and each open /slots/stream listener, on a greenlet,
+# so thousands of idle schedule pages cost no threads. mysql-connector must then
+# use its pure-Python protocol (DB_PURE_DRIVER), whose socket waits yield to the loop.
+worker_class = os.environ.get("WEB_WORKER_CLASS", "gevent")
+worker_connections = int(os.environ.get("WEB_WORKER_CONNECTIONS", 5000))
+threads = int(os.environ.get("WEB_THREADS", 8))
+if worker_class == "gevent":
+    os.environ.setdefault("DB_PURE_DRIVER", "1")
+    # keep a fifth of the connections for ordinary requests
+    os.environ.setdefault("SSE_MAX_SUBSCRIBERS", str(worker_connections * 4 // 5))
+else:
+    # every open stream pins a thread, so only a quarter of them may stream and the
+    # other schedule pages fall back to polling availability every 30 s
+    os.environ.setdefault("SSE_MAX_SUBSCRIBERS", str(threads // 4 if worker_class == "gthread" else 0))
+timeout = int(os.environ.get("WEB_TIMEOUT", 60))
+keepalive = 5
+max_requests = int(os.environ.get("WEB_MAX_REQUESTS", 10000))
+max_requests_jitter = max_requests // 10
+
+# Off by default: every worker imports wsgi after the fork and builds its own
+# engine and pool. With preloading, post_fork drops what the parent created.
+preload_app = os.environ.get("WEB_PRELOAD", "0") == "1"
+
+
+def post_fork(server, worker):
+    if preload_app:
+        import app
+        import wsgi
+        app.after_fork(wsgi.app)
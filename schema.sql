@@ -50,7 +50,8 @@ CREATE TABLE IF NOT EXISTS appointments (
   FOREIGN KEY (doctor_id) REFERENCES doctors(id) ON DELETE RESTRICT ON UPDATE CASCADE,
   CHECK (end_datetime > start_datetime),
   INDEX idx_doctor_start (doctor_id, start_datetime),
-  INDEX idx_patient_start (patient_id, start_datetime)
+  INDEX idx_patient_start (patient_id, start_datetime),
+  INDEX idx_status_start (status, start_datetime)
 ) ENGINE=InnoDB;
 
 -- =====================
@@ -79,12 +80,123 @@ CREATE TABLE IF NOT EXISTS bills (
   created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
   FOREIGN KEY (patient_id) REFERENCES patients(id) ON DELETE CASCADE ON UPDATE CASCADE,
   FOREIGN KEY (appointment_id) REFERENCES appointments(id) ON DELETE SET NULL ON UPDATE CASCADE,
-  CHECK (amount >= 0)
+  CHECK (amount >= 0),
+  INDEX idx_bill_status_paid (status, paid_at)
+) ENGINE=InnoDB;
+
+-- =====================
+-- SLOT RESERVATIONS
+-- =====================
+-- Used when the app runs with SLOT_RESERVATIONS enabled: every booked 30-minute
+-- slot claims one row, so a double booking fails on the primary key in O(1)
+-- instead of relying on the trigger range scans below. Canceling an appointment
+-- deletes its rows; run `flask backfill-reservations` once before enabling.
+CREATE TABLE IF NOT EXISTS slot_reservations (
+  doctor_id INT NOT NULL,
+  slot_start DATETIME NOT NULL,
+  appointment_id INT NOT NULL,
+  PRIMARY KEY (doctor_id, slot_start),
+  INDEX idx_reservation_appointment (appointment_id),
+  FOREIGN KEY (doctor_id) REFERENCES doctors(id) ON DELETE RESTRICT ON UPDATE CASCADE,
+  FOREIGN KEY (appointment_id) REFERENCES appointments(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- =====================
+-- PATIENT BALANCES (billing ledger)
+-- =====================
+-- Maintained by the app in the same transaction as bill inserts and payments;
+-- `flask rebuild-ledger` recomputes it from bills.
+CREATE TABLE IF NOT EXISTS patient_balances (
+  patient_id INT PRIMARY KEY,
+  outstanding DOUBLE NOT NULL DEFAULT 0,
+  paid_total DOUBLE NOT NULL DEFAULT 0,
+  unpaid_count INT NOT NULL DEFAULT 0,
+  pending_count INT NOT NULL DEFAULT 0,
+  paid_count INT NOT NULL DEFAULT 0,
+  updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  FOREIGN KEY (patient_id) REFERENCES patients(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- =====================
+-- ANALYTICS ROLLUPS
+-- =====================
+-- Daily counts and amounts per doctor and per department, keyed by the
+-- appointment's day. The app updates them with each booking, cancellation,
+-- payment and completion; `flask rebuild-rollups` recomputes both from
+-- appointments, bills and their archives.
+CREATE TABLE IF NOT EXISTS doctor_day_stats (
+  doctor_id INT NOT NULL,
+  day DATE NOT NULL,
+  booked INT NOT NULL DEFAULT 0,
+  canceled INT NOT NULL DEFAULT 0,
+  completed INT NOT NULL DEFAULT 0,
+  billed DOUBLE NOT NULL DEFAULT 0,
+  paid DOUBLE NOT NULL DEFAULT 0,
+  PRIMARY KEY (doctor_id, day)
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS department_day_stats (
+  department VARCHAR(100) NOT NULL,
+  day DATE NOT NULL,
+  booked INT NOT NULL DEFAULT 0,
+  canceled INT NOT NULL DEFAULT 0,
+  completed INT NOT NULL DEFAULT 0,
+  billed DOUBLE NOT NULL DEFAULT 0,
+  paid DOUBLE NOT NULL DEFAULT 0,
+  PRIMARY KEY (department, day)
+) ENGINE=InnoDB;
+
+-- =====================
+-- ARCHIVE
+-- =====================
+-- `flask maintenance` (or the in-process worker) moves appointments and paid
+-- bills older than ARCHIVE_AFTER_DAYS here so the hot tables and their indexes
+-- stay small. No foreign keys: archived rows outlive what they referenced.
+CREATE TABLE IF NOT EXISTS appointments_archive (
+  id INT PRIMARY KEY,
+  patient_id INT NOT NULL,
+  doctor_id INT NOT NULL,
+  start_datetime DATETIME NOT NULL,
+  end_datetime DATETIME NOT NULL,
+  status ENUM('scheduled','completed','canceled'),
+  reason VARCHAR(255),
+  created_at DATETIME,
+  archived_at DATETIME NOT NULL,
+  INDEX idx_archive_patient (patient_id)
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS bills_archive (
+  id INT PRIMARY KEY,
+  patient_id INT NOT NULL,
+  appointment_id INT,
+  amount DECIMAL(10,2) NOT NULL DEFAULT 0.00,
+  status ENUM('unpaid','pending','paid'),
+  paid_at DATETIME,
+  created_at DATETIME,
+  archived_at DATETIME NOT NULL,
+  INDEX idx_bill_archive_patient (patient_id)
+) ENGINE=InnoDB;
+
+-- =====================
+-- IMPORT CHECKPOINTS
+-- =====================
+-- `flask import` commits this row with every chunk so interrupted imports resume
+CREATE TABLE IF NOT EXISTS import_checkpoints (
+  source VARCHAR(255) PRIMARY KEY,
+  rows_done INT NOT NULL DEFAULT 0,
+  updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
 ) ENGINE=InnoDB;
 
 -- =====================
 -- TRIGGERS
 -- =====================
+-- Each appointment write runs a range scan over the doctor's bookings. They are
+-- the clash check when SLOT_RESERVATIONS is off. With it on, the
+-- slot_reservations primary key makes the same check, so drop them once every
+-- app process runs in reservation mode (`flask backfill-reservations
+-- --drop-triggers` does the backfill and this in one go):
+--   DROP TRIGGER IF EXISTS trg_appointments_no_overlap_insert;
+--   DROP TRIGGER IF EXISTS trg_appointments_no_overlap_update;
 
 -- prevent overlapping appointments (INSERT)
 DELIMITER $$
@@ -14,10 +14,23 @@ document.addEventListener("DOMContentLoaded", () => {
     return res.json();
   }
 
+  // current user, favorites, next visit and unpaid count in one request per page
+  let bootPromise = null;
+  function loadBootstrap(){
+    if (!bootPromise) bootPromise = api("/api/bootstrap").catch(() => ({ user: null, favorite_doctor_ids: [], next_appointment: null, unpaid_bills: 0 }));
+    return bootPromise;
+  }
+
+  // doctor directory, shared by the widgets of one page
+  let doctorsPromise = null;
+  function loadDoctors(){
+    if (!doctorsPromise) doctorsPromise = api("/api/doctors");
+    return doctorsPromise;
+  }
+
   // get current user from server session
   async function loadMe(){
-    try { const r = await api("/api/me"); return r.user; }
-    catch { return null; }
+    return (await loadBootstrap()).user;
   }
 
   // FAVORITE DOCTOR (on doctor detail page)
@@ -26,10 +39,9 @@ document.addEventListener("DOMContentLoaded", () => {
     const path = location.pathname.split("/").filter(Boolean);
     const docId = parseInt(path[1]); // /doctor/<id>
     // Load current favs
-    fetch(`/api/favorites`)
-      .then(res => res.json())
-      .then(favs => {
-        if (favs.some(f => f.doctor_id === docId)) {
+    loadBootstrap()
+      .then(boot => {
+        if (boot.favorite_doctor_ids.includes(docId)) {
           favBtn.textContent = "★ Favorited";
           favBtn.classList.remove("btn-outline-primary");
           favBtn.classList.add("btn-warning");
@@ -67,23 +79,24 @@ document.addEventListener("DOMContentLoaded", () => {
     });
   }
 
-  // DASHBOARD FAVORITES
+  // DASHBOARD FAVORITES - ids from bootstrap, details from the cached doctor list
   const favDoctorsDiv = document.getElementById("favDoctors");
   if (favDoctorsDiv) {
-    fetch(`/api/favorites`)
-      .then(res => res.json())
-      .then(favs => {
+    Promise.all([loadBootstrap(), loadDoctors()])
+      .then(([boot, docs]) => {
+        const byId = new Map(docs.map(d => [d.id, d]));
+        const favs = boot.favorite_doctor_ids.map(id => byId.get(id)).filter(Boolean);
         favDoctorsDiv.innerHTML = favs.length ? favs.map(f => `
           <div class="col-md-4">
             <div class="card p-3">
               <img src="${f.photo_url || 'https://via.placeholder.com/100'}" class="rounded-circle mb-2" width="80">
-              <h5>${f.doctor_name}</h5>
+              <h5>${f.name}</h5>
               <p class="muted">${f.department}</p>
-              <a href="/doctor/${f.doctor_id}" class="btn btn-sm btn-outline-secondary">View</a>
+              <a href="/doctor/${f.id}" class="btn btn-sm btn-outline-secondary">View</a>
             </div>
           </div>
         `).join("") : `<div class="muted">No favorites yet</div>`;
-      });
+      }).catch(e => console.error(e));
   }
 
   // LOGIN page
@@ -132,11 +145,17 @@ document.addEventListener("DOMContentLoaded", () => {
     });
   }
 
-  // Doctors list page - use d.photo_url to avoid random images
+  // Doctors list page - search/filter/sort are answered by /api/doctors/search
   const doctorsListEl = document.getElementById("doctorsList");
   if (doctorsListEl) {
-    fetch("/api/doctors").then(r=>r.json()).then(docs => {
-      doctorsListEl.innerHTML = docs.map(d => `
+    const qEl = document.getElementById("doctorQuery");
+    const deptEl = document.getElementById("doctorDept");
+    const expEl = document.getElementById("doctorMinExp");
+    const sortEl = document.getElementById("doctorSort");
+    const moreEl = document.getElementById("doctorsMore");
+    let nextCursor = null, timer = null;
+    function card(d){
+      return `
         <div class="col-12 col-md-6 col-lg-4">
           <div class="doctor-card">
             <img src="${d.photo_url || 'https://via.placeholder.com/100'}" width="64" height="64" style="border-radius:50%">
@@ -148,8 +167,34 @@ document.addEventListener("DOMContentLoaded", () => {
             </div>
           </div>
         </div>
-      `).join("");
-    }).catch(()=>{ doctorsListEl.innerHTML = "<div class='muted'>Unable to load doctors</div>"; });
+      `;
+    }
+    async function search(more){
+      const qs = new URLSearchParams({ limit: "30" });
+      if (qEl && qEl.value.trim()) qs.set("q", qEl.value.trim());
+      if (deptEl && deptEl.value) qs.set("department", deptEl.value);
+      if (expEl && expEl.value) qs.set("min_experience", expEl.value);
+      if (sortEl) qs.set("sort", sortEl.value);
+      if (more && nextCursor) qs.set("cursor", nextCursor);
+      try {
+        const res = await api(`/api/doctors/search?${qs}`);
+        const html = res.items.map(card).join("");
+        if (more) doctorsListEl.insertAdjacentHTML("beforeend", html);
+        else doctorsListEl.innerHTML = html || "<div class='muted'>No doctors match your search</div>";
+        if (deptEl && !more) {
+          const current = deptEl.value;
+          deptEl.innerHTML = `<option value="">All departments</option>` + Object.entries(res.facets.department)
+            .sort((a,b)=>a[0].localeCompare(b[0]))
+            .map(([name, n]) => `<option value="${name}" ${name===current?"selected":""}>${name} (${n})</option>`).join("");
+        }
+        nextCursor = res.next_cursor;
+        if (moreEl) moreEl.style.display = nextCursor ? "inline-block" : "none";
+      } catch(e){ doctorsListEl.innerHTML = "<div class='muted'>Unable to load doctors</div>"; }
+    }
+    [qEl, expEl].forEach(el => el && el.addEventListener("input", ()=>{ clearTimeout(timer); timer = setTimeout(()=>search(false), 250); }));
+    [deptEl, sortEl].forEach(el => el && el.addEventListener("change", ()=>search(false)));
+    if (moreEl) moreEl.addEventListener("click", ()=>search(true));
+    search(false);
   }
 
   // Doctor detail page
@@ -191,6 +236,7 @@ document.addEventListener("DOMContentLoaded", () => {
             if (selectedDates && selectedDates.length) {
               const d = selectedDates[0];
               chosenDate = d.toISOString().slice(0,10);
+              loadSlots();
             }
           }
         });
@@ -199,23 +245,76 @@ document.addEventListener("DOMContentLoaded", () => {
         const d = new Date(); chosenDate = d.toISOString().slice(0,10);
       }
 
-      // time slots (same as before)
-      const times = ["09:00 AM","09:30 AM","10:00 AM","11:00 AM","11:30 AM","02:00 PM","02:30 PM","03:00 PM"];
+      // time slots come from the server so booked/past ones can be disabled
       const slotsEl = document.getElementById("schedTimeSlots");
-      slotsEl.innerHTML = times.map(t => `<button class="slot btn btn-outline-primary btn-sm">${t}</button>`).join("");
+      function label(hhmm){
+        let [hh, mm] = hhmm.split(":").map(Number);
+        const ampm = hh >= 12 ? "PM" : "AM";
+        if (hh > 12) hh -= 12;
+        if (hh === 0) hh = 12;
+        return `${String(hh).padStart(2,"0")}:${String(mm).padStart(2,"0")} ${ampm}`;
+      }
+      async function loadSlots(){
+        chosenTime = null;
+        if (!chosenDate) { slotsEl.innerHTML = `<div class="muted small">Pick a date first</div>`; return; }
+        try {
+          const av = await api(`/api/doctors/${docId}/availability?from=${chosenDate}&to=${chosenDate}`);
+          const slots = av.days.length ? av.days[0].slots : [];
+          slotsEl.innerHTML = slots.map(s => `<button class="slot btn btn-outline-primary btn-sm" data-start="${s.start}" ${s.available ? "" : "disabled"}>${label(s.time)}</button>`).join("")
+            || `<div class="muted small">No slots on this day</div>`;
+        } catch(e){ slotsEl.innerHTML = `<div class="muted small">Unable to load slots</div>`; return; }
+        slotsEl.querySelectorAll(".slot").forEach(s => s.addEventListener("click", ()=> {
+          slotsEl.querySelectorAll(".slot").forEach(x=>x.classList.remove("active"));
+          s.classList.add("active"); chosenTime = s.textContent.trim();
+        }));
+      }
 
       const dateInput = document.getElementById("appointmentDate");
       // if user picks date by typing or default value, update chosenDate
       if (dateInput) {
         dateInput.addEventListener("change", () => {
-          if (dateInput.value) chosenDate = dateInput.value;
+          if (dateInput.value) { chosenDate = dateInput.value; loadSlots(); }
         });
       }
+      loadSlots();
 
-      slotsEl.querySelectorAll(".slot").forEach(s => s.addEventListener("click", ()=> {
-        slotsEl.querySelectorAll(".slot").forEach(x=>x.classList.remove("active"));
-        s.classList.add("active"); chosenTime = s.textContent.trim();
-      }));
+      // live updates: other patients' bookings and cancellations flip slots in place
+      function markSlot(start, taken){
+        const btn = slotsEl.querySelector(`.slot[data-start="${start}"]`);
+        if (!btn) return;
+        btn.disabled = taken || new Date(start) <= new Date();
+        if (btn.disabled && btn.classList.contains("active")) {
+          btn.classList.remove("active"); chosenTime = null;
+          toast("That slot was just taken — pick another");
+        }
+      }
+      // without a stream (the server refuses them when busy) re-check the day instead
+      let pollTimer = null;
+      function pollSlots(){
+        if (pollTimer) return;
+        pollTimer = setInterval(async () => {
+          if (!chosenDate || document.hidden) return;
+          try {
+            const av = await api(`/api/doctors/${docId}/availability?from=${chosenDate}&to=${chosenDate}`);
+            (av.days.length ? av.days[0].slots : []).forEach(s => markSlot(s.start, !s.available));
+          } catch(e){}
+        }, 30000);
+      }
+      if (window.EventSource) {
+        const es = new EventSource(`/api/doctors/${docId}/slots/stream`);
+        let connected = false;
+        // events may have been missed while reconnecting
+        es.onopen = () => { if (connected) loadSlots(); connected = true; };
+        // a refused (503) stream is closed for good rather than retried
+        es.onerror = () => { if (es.readyState === EventSource.CLOSED) pollSlots(); };
+        es.addEventListener("resync", () => loadSlots());
+        es.addEventListener("slot", ev => {
+          const e = JSON.parse(ev.data);
+          e.slots.forEach(start => markSlot(start, e.booked));
+        });
+      } else {
+        pollSlots();
+      }
 
       document.getElementById("confirmSched").addEventListener("click", async ()=> {
         const user = await loadMe();
@@ -260,6 +359,7 @@ document.addEventListener("DOMContentLoaded", () => {
   if (err.status === 409) toast("Time clash — pick another slot");
   else toast("Time clash — pick another slot");
   console.error("Error while booking:", err);
+  loadSlots();
 }
 
       });
@@ -280,21 +380,15 @@ document.addEventListener("DOMContentLoaded", () => {
     })();
   }
 
-  // Appointments page (tabs)
+  // Appointments page (tabs) - tab filter and paging are done server-side
   if (document.getElementById("apptsContainer")) {
     (async ()=> {
       const tabs = document.querySelectorAll("#apptTabs button");
+      const tabStatus = { upcoming: "scheduled", completed: "completed", canceled: "canceled" };
       let active = "upcoming";
       tabs.forEach(b => b.addEventListener("click", ()=> { tabs.forEach(x=>x.classList.remove("active")); b.classList.add("active"); active = b.dataset.tab; render(); }));
-      async function render(){
-        const appts = await api("/api/appointments?mine=1");
-        let filtered = appts;
-        if (active === "upcoming") filtered = appts.filter(a => a.status === "scheduled");
-        if (active === "completed") filtered = appts.filter(a => a.status === "completed");
-        if (active === "cancelled") filtered = appts.filter(a => a.status === "canceled");
-        const container = document.getElementById("apptsContainer");
-        if (!filtered.length){ container.innerHTML = `<div class="muted">No ${active} appointments.</div>`; return; }
-        container.innerHTML = filtered.map(a => `
+      function card(a){
+        return `
           <div class="card p-3 mb-3">
             <div class="d-flex justify-content-between">
               <div>
@@ -310,11 +404,25 @@ document.addEventListener("DOMContentLoaded", () => {
               </div>
             </div>
           </div>
-        `).join("");
-        container.querySelectorAll(".cancel").forEach(btn=>btn.addEventListener("click", async (e)=>{
+        `;
+      }
+      async function render(cursor){
+        const container = document.getElementById("apptsContainer");
+        const qs = new URLSearchParams({ mine: "1", status: tabStatus[active] || "scheduled" });
+        if (cursor) qs.set("cursor", cursor);
+        const page = await api(`/api/appointments?${qs}`);
+        container.querySelector(".load-more")?.remove();
+        if (!cursor && !page.items.length){ container.innerHTML = `<div class="muted">No ${active} appointments.</div>`; return; }
+        const html = page.items.map(card).join("");
+        if (cursor) container.insertAdjacentHTML("beforeend", html); else container.innerHTML = html;
+        if (page.next_cursor) {
+          container.insertAdjacentHTML("beforeend", `<button class="btn btn-sm btn-outline-primary load-more">Load more</button>`);
+          container.querySelector(".load-more").addEventListener("click", ()=> render(page.next_cursor));
+        }
+        container.querySelectorAll(".cancel:not([data-bound])").forEach(btn=>{ btn.dataset.bound = "1"; btn.addEventListener("click", async (e)=>{
           const id = e.target.dataset.id;
           try { await api(`/api/appointments/${id}`, { method:"DELETE" }); toast("Canceled"); render(); } catch(e){ toast("Failed"); }
-        }));
+        }); });
       }
       render();
     })();
@@ -337,7 +445,7 @@ document.addEventListener("DOMContentLoaded", () => {
       }
       // doctors preview
       try {
-        const docs = await api("/api/doctors");
+        const docs = await loadDoctors();
         const preview = document.getElementById("doctorsPreview");
         if (preview) {
           preview.innerHTML = docs.slice(0,4).map(d => `
@@ -356,16 +464,11 @@ document.addEventListener("DOMContentLoaded", () => {
       } catch(e){ console.error(e); }
       // next appointment preview
       try {
-        const appts = await api("/api/appointments?mine=1");
-        const upcoming = appts.filter(a=>a.status==='scheduled').sort((x,y)=> new Date(x.start_datetime) - new Date(y.start_datetime));
+        const n = (await loadBootstrap()).next_appointment;
         const nextEl = document.getElementById("nextAppt");
         if (nextEl) {
-          if (!upcoming.length) nextEl.innerHTML = `<div class="muted">No upcoming appointments — book one now.</div>`;
-          else {
-            const n = upcoming[0];
-            const doc = await api(`/api/doctors/${n.doctor_id}`);
-            nextEl.innerHTML = `<div class="appt-card d-flex justify-content-between align-items-center"><div><div class="small muted">Next</div><div class="fw-bold">${doc.name}</div><div class="muted small">${new Date(n.start_datetime).toLocaleString()}</div></div><div><a href="/appointments" class="btn btn-sm btn-outline-primary">View</a></div></div>`;
-          }
+          if (!n) nextEl.innerHTML = `<div class="muted">No upcoming appointments — book one now.</div>`;
+          else nextEl.innerHTML = `<div class="appt-card d-flex justify-content-between align-items-center"><div><div class="small muted">Next</div><div class="fw-bold">${n.doctor_name}</div><div class="muted small">${new Date(n.start_datetime).toLocaleString()}</div></div><div><a href="/appointments" class="btn btn-sm btn-outline-primary">View</a></div></div>`;
         }
       } catch(e){ console.error(e); }
     })();
@@ -407,8 +510,15 @@ document.addEventListener("DOMContentLoaded", () => {
 
       profileForm.addEventListener("submit", async (e)=>{
         e.preventDefault();
-        // Simple local update: you can add api to update server if desired
-        toast("Profile saved (local)"); // keep it simple for demo
+        try {
+          await api("/api/me", { method:"PUT", headers:{"Content-Type":"application/json"}, body: JSON.stringify({
+            name: nameEl ? nameEl.value.trim() : undefined,
+            dob: dobEl ? dobEl.value : undefined,
+            contact: contactEl ? contactEl.value.trim() : undefined
+          })});
+          toast("Profile saved");
+          editMode = false; setReadonly(true); editBtn.textContent = "Edit";
+        } catch(err){ toast("Could not save profile"); console.error(err); }
       });
     })();
   }
@@ -0,0 +1,67 @@
+"""Hot routes must stay within their query budgets (strict mode turns overruns into 500s)."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import create_app, db, seed_doctors, Patient
+
+BUDGETS = {
+    "api_bootstrap": 2,
+    "api_favorites": 2,
+    "api_appointments": 10,  # the booking POST: doctor, appointment, slot, bill, ledger, rollups
+}
+
+
+@pytest.fixture
+def client():
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": "sqlite://",
+        "STATIC_BUILD": False,
+        "QUERY_BUDGETS": BUDGETS,
+        "QUERY_BUDGET_STRICT": True,
+    })
+    with app.app_context():
+        db.create_all()
+        seed_doctors()
+        db.session.add(Patient(name="Test", email="test@example.com", password="password"))
+        db.session.commit()
+    client = app.test_client()
+    assert client.post("/api/login", json={"email": "test@example.com", "password": "password"}).status_code == 200
+    yield client
+    with app.app_context():
+        db.drop_all()
+        db.engine.dispose()
+
+
+def check(resp):
+    assert resp.status_code == 200, resp.get_json()
+    return int(resp.headers["X-Query-Count"])
+
+
+def test_bootstrap(client):
+    assert check(client.get("/api/bootstrap")) <= BUDGETS["api_bootstrap"]
+    assert check(client.get("/api/bootstrap")) == 0  # served from the user cache
+
+
+def test_favorites(client):
+    check(client.post("/api/favorites", json={"doctor_id": 1}))
+    check(client.post("/api/favorites", json={"doctor_id": 2}))
+    resp = client.get("/api/favorites")
+    check(resp)
+    assert len(resp.get_json()) == 2
+
+
+def test_appointments(client):
+    day = (datetime.now() + timedelta(days=2)).date()
+    for hour in (9, 10, 11):
+        check(client.post("/api/appointments", json={"doctor_id": 1, "start_datetime": f"{day}T{hour:02d}:00:00"}))
+    resp = client.get("/api/appointments?mine=1")
+    check(resp)
+    assert len(resp.get_json()["items"]) == 3
+
+
+def test_overrun_fails_in_strict_mode(client):
+    client.application.config["QUERY_BUDGETS"] = dict(BUDGETS, api_favorites=0)
+    resp = client.get("/api/favorites")
+    assert resp.status_code == 500
+    assert "Query budget exceeded" in resp.get_json()["error"]
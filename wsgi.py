@@ -0,0 +1,23 @@
+"""Production entry point.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+    flask --app wsgi init-db          # also: maintenance, import, rebuild-ledger, ...
+
+Everything is configured through the environment: DATABASE_URL (MySQL, or
+e.g. sqlite:///instance/meddb.sqlite for the WAL-mode local backend, which
+always runs with SLOT_RESERVATIONS), DB_POOL_SIZE, DB_MAX_OVERFLOW,
+DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING, SECRET_KEY, ADMIN_TOKEN
+and CACHE_VERSION_DB.
+
+Live slot streams (/api/doctors/<id>/slots/stream) stay open for minutes. The
+default gevent worker holds them on greenlets, up to SSE_MAX_SUBSCRIBERS
+(4000 of the 5000 worker connections) per worker. On thread-based servers each
+stream occupies a thread: with WEB_WORKER_CLASS=gthread only threads // 4
+streams per worker are accepted, and outside gunicorn (flask run, other WSGI
+servers) the default is 2. Schedule pages beyond the cap get 503 and poll
+availability every 30 s instead. SQLite lock waits block a gevent worker, so
+the SQLite backend is meant for single-host, low-contention use.
+"""
+from app import create_app
+
+app = create_app()